@@ -1,9 +1,11 @@
-from flask import Flask, request, jsonify, render_template_string, send_from_directory
+from flask import Flask, request, jsonify, render_template_string, send_file, abort
+from werkzeug.security import safe_join
 from flask_cors import CORS
 import numpy as np
 from simulation.quantum_channel import QuantumChannelSimulator
 import os
 import logging
+import queue
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
@@ -13,8 +15,24 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app)
 
-# Initialize simulator
-simulator = QuantumChannelSimulator()
+# Let a fronting nginx/apache transfer static files with X-Sendfile (opt-in,
+# since the dev server cannot honour the header)
+app.config['USE_X_SENDFILE'] = os.environ.get('USE_X_SENDFILE', '').lower() in ('1', 'true', 'yes')
+
+# Simulators hold RNG state and work buffers that are costly to rebuild, so idle
+# ones are pooled and reused by later requests (each is used by one request at a time)
+_simulator_pool = queue.SimpleQueue()
+
+def acquire_simulator() -> QuantumChannelSimulator:
+    """Take an idle simulator from the pool, creating one if none is free"""
+    try:
+        return _simulator_pool.get_nowait()
+    except queue.Empty:
+        return QuantumChannelSimulator()
+
+def release_simulator(simulator: QuantumChannelSimulator) -> None:
+    """Return a simulator to the pool for reuse"""
+    _simulator_pool.put(simulator)
 
 @app.route('/')
 def index():
@@ -36,12 +54,17 @@ def index():
 @app.route('/static/<path:path>')
 def serve_static(path):
     """Serve static files"""
+    static_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'static'))
+    logger.debug("Attempting to serve %s from %s", path, static_dir)
+    full_path = safe_join(static_dir, path)
+    if full_path is None or not os.path.isfile(full_path):
+        abort(404)
     try:
-        static_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'static'))
-        logger.debug(f"Attempting to serve {path} from {static_dir}")
-        return send_from_directory(static_dir, path)
+        # send_file streams through wsgi.file_wrapper (sendfile under gunicorn)
+        # and honours USE_X_SENDFILE
+        return send_file(full_path, conditional=True)
     except Exception as e:
-        logger.error(f"Error serving {path}: {str(e)}")
+        logger.error("Error serving %s: %s", path, e)
         return str(e), 500
 
 @app.route('/api/simulate', methods=['POST'])
@@ -50,7 +73,7 @@ def run_simulation():
     try:
         # Get parameters from request
         params = request.get_json()
-        logger.debug(f"Received simulation parameters: {params}")
+        logger.debug("Received simulation parameters: %s", params)
         
         # Convert parameters to simulation format
         config = {
@@ -73,8 +96,13 @@ def run_simulation():
             }
         }
         
-        # Run simulation
-        results = simulator.run(config)
+        # Run simulation; a client-supplied seed lets repeated runs reuse Alice's states
+        seed = params.get('seed')
+        simulator = acquire_simulator()
+        try:
+            results = simulator.run(config, seed=None if seed is None else int(seed))
+        finally:
+            release_simulator(simulator)
         logger.debug("Simulation completed successfully")
         
         return jsonify({
@@ -83,7 +111,7 @@ def run_simulation():
         })
         
     except Exception as e:
-        logger.error(f"Error in simulation: {str(e)}")
+        logger.error("Error in simulation: %s", e)
         return jsonify({
             'status': 'error',
             'message': str(e)
@@ -105,20 +133,22 @@ if __name__ == '__main__':
     if not os.path.isdir(static_dir):
         raise Exception(f"Static directory not found: {static_dir}")
     
-    # List contents of static directory
-    logger.info("Static directory contents:")
-    for root, dirs, files in os.walk(static_dir):
-        level = root.replace(static_dir, '').count(os.sep)
-        indent = ' ' * 4 * level
-        logger.info(f"{indent}{os.path.basename(root)}/")
-        subindent = ' ' * 4 * (level + 1)
-        for f in files:
-            filepath = os.path.join(root, f)
-            perms = oct(os.stat(filepath).st_mode)[-3:]
-            logger.info(f"{subindent}{f} (permissions: {perms})")
+    # List contents of static directory (skip the walk when INFO is not logged)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Static directory contents:")
+        for root, dirs, files in os.walk(static_dir):
+            level = root.replace(static_dir, '').count(os.sep)
+            indent = ' ' * 4 * level
+            logger.info("%s%s/", indent, os.path.basename(root))
+            subindent = ' ' * 4 * (level + 1)
+            for f in files:
+                filepath = os.path.join(root, f)
+                perms = oct(os.stat(filepath).st_mode)[-3:]
+                logger.info("%s%s (permissions: %s)", subindent, f, perms)
             
     # Print paths for debugging
-    logger.info(f"Static directory: {static_dir}")
-    logger.info(f"Current working directory: {os.getcwd()}")
+    logger.info("Static directory: %s", static_dir)
+    logger.info("Current working directory: %s", os.getcwd())
     
-    app.run(debug=True, port=5000)
\ No newline at end of file
+    # Serve concurrent simulation requests from separate threads
+    app.run(debug=True, port=5000, threaded=True)
\ No newline at end of file
@@ -1,9 +1,13 @@
 import yaml
+import json
 from pathlib import Path
 from typing import Dict, Any
 import uuid
 from datetime import datetime
 
+# libyaml bindings parse much faster; fall back to the pure-Python loader
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 class ConfigManager:
     """Handles parameter validation and configuration file operations"""
     
@@ -27,6 +31,13 @@ class ConfigManager:
         }
     }
 
+    # PARAMETER_SPECS flattened once into (group, name, type, min, max, default) records
+    _FLAT_SPECS = tuple(
+        (group, param_name, spec['type'], spec['min'], spec['max'], spec['default'])
+        for group, specs in PARAMETER_SPECS.items()
+        for param_name, spec in specs.items()
+    )
+
     def validate_parameters(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """
         Validate and normalize simulation parameters
@@ -48,32 +59,30 @@ class ConfigManager:
             'timestamp': datetime.utcnow().isoformat(),
             'version': '1.0'
         }
-
-        # Validate each parameter group
-        for group, specs in self.PARAMETER_SPECS.items():
+        for group in self.PARAMETER_SPECS:
             validated[group] = {}
-            group_params = params.get(group, {})
+
+        # Validate each parameter record
+        for group, param_name, value_type, min_value, max_value, default in self._FLAT_SPECS:
+            value = params.get(group, {}).get(param_name, default)
+            
+            # Type checking
+            try:
+                value = value_type(value)
+            except (TypeError, ValueError):
+                raise ValueError(
+                    f"Invalid type for {group}.{param_name}. "
+                    f"Expected {value_type.__name__}"
+                )
+            
+            # Range checking
+            if value < min_value or value > max_value:
+                raise ValueError(
+                    f"Parameter {group}.{param_name} must be between "
+                    f"{min_value} and {max_value}"
+                )
             
-            for param_name, constraints in specs.items():
-                value = group_params.get(param_name, constraints['default'])
-                
-                # Type checking
-                try:
-                    value = constraints['type'](value)
-                except (TypeError, ValueError):
-                    raise ValueError(
-                        f"Invalid type for {group}.{param_name}. "
-                        f"Expected {constraints['type'].__name__}"
-                    )
-                
-                # Range checking
-                if value < constraints['min'] or value > constraints['max']:
-                    raise ValueError(
-                        f"Parameter {group}.{param_name} must be between "
-                        f"{constraints['min']} and {constraints['max']}"
-                    )
-                
-                validated[group][param_name] = value
+            validated[group][param_name] = value
         
         return validated
 
@@ -94,13 +103,66 @@ class ConfigManager:
         path = Path(file_path)
         if not path.exists():
             raise FileNotFoundError(f"Configuration file not found: {file_path}")
-            
-        with path.open('r') as f:
-            config = yaml.safe_load(f)
+        
+        # Reuse the parsed contents from the sidecar cache while the file is unchanged
+        stat = path.stat()
+        cache_path = path.with_name(path.name + '.cache.json')
+        config = self._read_config_cache(cache_path, stat.st_mtime_ns, stat.st_size)
+        
+        if config is None:
+            with path.open('r') as f:
+                config = yaml.load(f, Loader=_YAML_LOADER)
+            self._write_config_cache(cache_path, stat.st_mtime_ns, stat.st_size, config)
             
         # Validate loaded parameters
         return self.validate_parameters(config)
 
+    @staticmethod
+    def _read_config_cache(cache_path: Path, mtime_ns: int, size: int) -> Any:
+        """
+        Read parsed configuration contents from a sidecar cache file
+        
+        Args:
+            cache_path: Path of the sidecar cache
+            mtime_ns: Modification time of the configuration file
+            size: Size of the configuration file in bytes
+            
+        Returns:
+            Cached contents, or None if the cache is missing or stale
+        """
+        try:
+            with cache_path.open('r') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if not isinstance(cached, dict) or cached.get('mtime_ns') != mtime_ns or cached.get('size') != size:
+            return None
+        return cached.get('config')
+
+    @staticmethod
+    def _write_config_cache(cache_path: Path, mtime_ns: int, size: int, config: Any) -> None:
+        """
+        Store parsed configuration contents in a sidecar cache file
+        
+        Contents that do not survive a JSON round trip unchanged (non-string
+        keys, dates, ...), or an unwritable directory, simply leave the file
+        uncached, so a cache hit always matches a fresh parse.
+        
+        Args:
+            cache_path: Path of the sidecar cache
+            mtime_ns: Modification time of the configuration file
+            size: Size of the configuration file in bytes
+            config: Parsed configuration contents
+        """
+        try:
+            payload = json.dumps({'mtime_ns': mtime_ns, 'size': size, 'config': config})
+            if json.loads(payload)['config'] != config:
+                return
+            cache_path.write_text(payload)
+        except (OSError, TypeError, ValueError):
+            pass
+
     def save_config(self, config: Dict[str, Any], file_path: str) -> None:
         """
         Save parameters to a YAML configuration file
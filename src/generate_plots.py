@@ -45,7 +45,7 @@ def generate_example_plots():
     # Plot photon counts
     plt.figure(figsize=(10, 6))
     counts = np.array(results['counts'])
-    time_bins = np.arange(len(counts)) * config['bob']['timeBin']
+    time_bins = np.arange(len(counts)) * results['counts_bin_size'] * config['bob']['timeBin']
     plt.plot(time_bins, counts, 'b-', label='Detection Events')
     plt.title('Photon Detection Events')
     plt.xlabel('Time (ps)')
@@ -112,15 +112,15 @@ def main():
         
         # Display statistics
         logger.info("\nSimulation Results:")
-        logger.info(f"Total counts: {stats['total_counts']}")
-        logger.info(f"Signal counts: {stats['signal_counts']}")
-        logger.info(f"Decoy counts: {stats['decoy_counts']}")
-        logger.info(f"Signal rate: {stats['signal_rate']:.2f} counts/s")
-        logger.info(f"Decoy rate: {stats['decoy_rate']:.2f} counts/s")
-        logger.info(f"QBER estimate: {stats['qber_estimate']:.4f}")
+        logger.info("Total counts: %s", stats['total_counts'])
+        logger.info("Signal counts: %s", stats['signal_counts'])
+        logger.info("Decoy counts: %s", stats['decoy_counts'])
+        logger.info("Signal rate: %.2f counts/s", stats['signal_rate'])
+        logger.info("Decoy rate: %.2f counts/s", stats['decoy_rate'])
+        logger.info("QBER estimate: %.4f", stats['qber_estimate'])
         
     except Exception as e:
-        logger.error(f"Simulation failed: {str(e)}")
+        logger.error("Simulation failed: %s", e)
         return 1
     
     return 0
@@ -1,11 +1,205 @@
 import numpy as np
-from scipy.signal import correlate
+from scipy.fft import rfft, irfft, next_fast_len
 from typing import Dict, Any, Tuple, Optional
 from dataclasses import dataclass
+from functools import lru_cache
+import math
+from numpy.lib.stride_tricks import sliding_window_view
 
-@dataclass
+# Per-byte popcount table for NumPy releases without np.bitwise_count
+_POPCOUNT_LUT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+# Upper bound on the packed lag-window block materialized at once
+_PACKED_BLOCK_BYTES = 1 << 24
+
+# Cost model for choosing the correlation method: FFT work per element of
+# n * log2(n) relative to one packed byte AND + popcount, and the fixed overhead
+# of the eight packed passes in the same units (measured on x86-64)
+_FFT_COST_FACTOR = 3
+_PACKED_OVERHEAD = 350_000
+
+# Maximum number of points in the serialized photon count series
+_MAX_COUNT_POINTS = 1000
+
+# Random extra delay (in bins) added on top of max_offset by the channel
+_MAX_EXTRA_DELAY = 1000
+
+# Seeded runs draw Alice's states and the channel from separate streams
+_STATES_STREAM = 0
+_CHANNEL_STREAM = 1
+
+
+def _popcount(packed: np.ndarray) -> np.ndarray:
+    """Number of set bits in each byte of a uint8 array"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(packed)
+    return _POPCOUNT_LUT[packed]
+
+
+def _is_binary(signal: np.ndarray) -> bool:
+    """Check whether an array only holds 0/1 values"""
+    if signal.dtype == np.bool_:
+        return True
+    if not np.issubdtype(signal.dtype, np.integer):
+        return False
+    return signal.size == 0 or (signal.min() >= 0 and signal.max() <= 1)
+
+
+@lru_cache(maxsize=2)
+def _seeded_spectrum(signal_prob: float, block_size: int, seed: int, n: int) -> np.ndarray:
+    """Memoized read-only conjugated real FFT of a seeded pattern (~8 bytes per pulse, so only a few are kept)"""
+    spectrum = np.conj(rfft(_seeded_intensity(signal_prob, block_size, seed), n))
+    spectrum.setflags(write=False)
+    return spectrum
+
+
+def _rfft_correlate_valid(intensity: np.ndarray,
+                          detections: np.ndarray,
+                          first_lag: int = 0,
+                          n_lags: Optional[int] = None,
+                          pattern_key: Optional[Tuple[float, int, int]] = None) -> np.ndarray:
+    """
+    Real-FFT cross-correlation equivalent to
+    correlate(intensity, detections, mode='valid')[first_lag:first_lag + n_lags]
+    
+    Args:
+        intensity: Alice's intensity array (the shorter signal)
+        detections: Bob's detection events
+        first_lag: Index of the first 'valid' lag to return
+        n_lags: Number of lags to return (default: all remaining lags)
+        pattern_key: (signal_prob, block_size, seed) when intensity is a seeded
+            pattern, so its spectrum is reused across runs
+        
+    Returns:
+        Correlation for each requested lag
+    """
+    total_lags = len(detections) - len(intensity) + 1
+    if n_lags is None:
+        n_lags = total_lags - first_lag
+    n = next_fast_len(len(detections), real=True)
+    
+    # Only seeded patterns are replayed, so only their spectrum is worth caching
+    if pattern_key is None:
+        spectrum = np.conj(rfft(intensity, n))
+    else:
+        spectrum = _seeded_spectrum(*pattern_key, n)
+    
+    # Circular correlation does not wrap for the first total_lags offsets since n >= len(detections);
+    # scipy.signal.correlate orders 'valid' lags from the far end
+    first_offset = total_lags - first_lag - n_lags
+    corr = irfft(spectrum * rfft(detections, n), n)[first_offset:first_offset + n_lags]
+    return corr[::-1]
+
+
+def _packed_correlate_valid(intensity: np.ndarray,
+                            detections: np.ndarray,
+                            first_lag: int = 0,
+                            n_lags: Optional[int] = None) -> np.ndarray:
+    """
+    Bit-packed cross-correlation of two binary signals
+    
+    Each lag is the popcount of the AND between the packed intensity and the
+    packed detections window, which is equivalent to
+    correlate(intensity, detections, mode='valid')[first_lag:first_lag + n_lags]
+    for 0/1 inputs. Only the requested lags are computed.
+    
+    Args:
+        intensity: Alice's binary intensity array (the shorter signal)
+        detections: Bob's binary detection events
+        first_lag: Index of the first 'valid' lag to compute
+        n_lags: Number of lags to compute (default: all remaining lags)
+        
+    Returns:
+        Integer correlation for each requested lag
+    """
+    total_lags = len(detections) - len(intensity) + 1
+    if n_lags is None:
+        n_lags = total_lags - first_lag
+    n_bytes = -(-len(intensity) // 8)
+    
+    # scipy.signal.correlate orders 'valid' lags from the far end, so lag j
+    # aligns intensity with detections[total_lags - 1 - j:]
+    first_offset = total_lags - first_lag - n_lags
+    
+    # Padding bits of the last intensity byte are zero, so they mask overhanging detections
+    packed_intensity = np.packbits(intensity)
+    block_rows = max(1, _PACKED_BLOCK_BYTES // max(n_bytes, 1))
+    
+    corr = np.empty(n_lags, dtype=np.int64)
+    for shift in range(min(8, n_lags)):
+        offsets = np.arange(shift, n_lags, 8)
+        # Offsets first_offset + shift, + 8, ... start on successive bytes of one packing
+        packed = np.packbits(detections[first_offset + shift:])
+        needed = len(offsets) - 1 + n_bytes
+        if len(packed) < needed:
+            packed = np.pad(packed, (0, needed - len(packed)))
+        windows = sliding_window_view(packed, n_bytes)
+        
+        for start in range(0, len(offsets), block_rows):
+            stop = min(start + block_rows, len(offsets))
+            overlap = _popcount(windows[start:stop] & packed_intensity)
+            corr[offsets[start:stop]] = overlap.sum(axis=1, dtype=np.int64)
+    
+    return corr[::-1]
+
+def _prefer_packed(n_intensity: int, n_detections: int, n_lags: int) -> bool:
+    """
+    Decide whether direct bit-packed correlation beats the real FFT
+    
+    Direct work grows with n_lags * len(intensity) while the FFT grows with
+    n log n of the detection length, so narrow lag windows on long blocks go
+    direct and wide windows or short blocks go through the FFT.
+    
+    Args:
+        n_intensity: Length of Alice's intensity array
+        n_detections: Length of Bob's detection array
+        n_lags: Number of lags to evaluate
+        
+    Returns:
+        True if the packed kernel is expected to be faster
+    """
+    n = next_fast_len(n_detections, real=True)
+    packed_cost = n_lags * -(-n_intensity // 8) + _PACKED_OVERHEAD
+    return packed_cost < _FFT_COST_FACTOR * n * math.log2(n)
+
+
+def _seeded_rng(seed: int, stream: int) -> np.random.Generator:
+    """Independent PCG64DXSM generator for one named stream of a seed"""
+    return np.random.Generator(np.random.PCG64DXSM(np.random.SeedSequence(seed, spawn_key=(stream,))))
+
+
+def _draw_intensity(rng: np.random.Generator,
+                    signal_prob: float,
+                    block_size: int) -> np.ndarray:
+    """
+    Draw Alice's signal/decoy pattern from a random generator
+    
+    Args:
+        rng: Random number generator to draw from
+        signal_prob: Probability of sending a signal pulse
+        block_size: Number of pulses
+        
+    Returns:
+        int8 intensity array (1 = signal, 0 = decoy)
+    """
+    # Draw the signal/decoy selection once as a boolean mask (float32 uniforms
+    # resolve probabilities to 2**-24, far finer than signal_prob needs)
+    mask = rng.random(block_size, dtype=np.float32) < signal_prob
+    
+    # The mask doubles as the intensity array for cross-correlation
+    return mask.view(np.int8)
+
+
+@lru_cache(maxsize=4)
+def _seeded_intensity(signal_prob: float, block_size: int, seed: int) -> np.ndarray:
+    """Memoized read-only pattern for a seeded run; it does not depend on the pulse powers"""
+    intensity = _draw_intensity(_seeded_rng(seed, _STATES_STREAM), signal_prob, block_size)
+    intensity.setflags(write=False)
+    return intensity
+
+@dataclass(frozen=True)
 class SimulationConfig:
-    """Configuration parameters for quantum channel simulation"""
+    """Configuration parameters for quantum channel simulation (immutable, so instances can be shared)"""
     # Alice parameters
     signal_power: float  # mu1: mean photon number per signal pulse
     decoy_power: float  # mu2: mean photon number per decoy pulse
@@ -35,12 +229,49 @@ class SimulationResults:
     qber: float
     sync_success: bool
 
+def _config_from_dict(config: Dict[str, Any]) -> SimulationConfig:
+    """
+    Convert a configuration dictionary to SimulationConfig
+    
+    Args:
+        config: Dictionary of simulation parameters
+        
+    Returns:
+        Validated SimulationConfig object
+        
+    Raises:
+        ValueError: If parameters are invalid
+    """
+    try:
+        return SimulationConfig(
+            signal_power=float(config['alice']['mu1']),
+            decoy_power=float(config['alice']['mu2']),
+            signal_prob=float(config['alice']['p1']),
+            dark_count_rate=float(config['bob']['darkCount']),
+            time_bin=float(config['bob']['timeBin']),
+            channel_loss_db=float(config['channel']['loss']),
+            sync_error_ppm=float(config['channel']['syncError']),
+            block_size=int(config['processing']['blockSize']),
+            max_offset=int(config['processing']['maxOffset'])
+        )
+    except (KeyError, ValueError) as e:
+        raise ValueError(f"Invalid configuration: {str(e)}")
+
+
 class QuantumChannelSimulator:
     """Simulates quantum channel communication between Alice and Bob"""
     
-    def __init__(self):
-        """Initialize simulator"""
+    def __init__(self, seed: Optional[int] = None):
+        """
+        Initialize simulator
+        
+        Args:
+            seed: Optional seed for the random number generator
+        """
         self.sampling_rate = 10e9  # 10 GHz sampling rate
+        self.rng = np.random.Generator(np.random.PCG64DXSM(seed))
+        self._prob_buf = None  # Reused float32 detection probability buffer
+        self._rand_buf = None  # Reused float64 uniform draws for detection
         
     def validate_config(self, config: Dict[str, Any]) -> SimulationConfig:
         """
@@ -55,54 +286,65 @@ class QuantumChannelSimulator:
         Raises:
             ValueError: If parameters are invalid
         """
-        try:
-            return SimulationConfig(
-                signal_power=float(config['alice']['mu1']),
-                decoy_power=float(config['alice']['mu2']),
-                signal_prob=float(config['alice']['p1']),
-                dark_count_rate=float(config['bob']['darkCount']),
-                time_bin=float(config['bob']['timeBin']),
-                channel_loss_db=float(config['channel']['loss']),
-                sync_error_ppm=float(config['channel']['syncError']),
-                block_size=int(config['processing']['blockSize']),
-                max_offset=int(config['processing']['maxOffset'])
-            )
-        except (KeyError, ValueError) as e:
-            raise ValueError(f"Invalid configuration: {str(e)}")
-
-    def generate_states(self, config: SimulationConfig) -> Tuple[np.ndarray, np.ndarray]:
+        return _config_from_dict(config)
+
+    def generate_intensity(self,
+                           config: SimulationConfig,
+                           seed: Optional[int] = None) -> np.ndarray:
+        """
+        Generate Alice's signal/decoy pattern
+        
+        Args:
+            config: Simulation parameters
+            seed: Optional seed; seeded patterns are cached and returned read-only
+            
+        Returns:
+            int8 intensity array (1 = signal, 0 = decoy)
+        """
+        if seed is not None:
+            return _seeded_intensity(config.signal_prob, int(config.block_size), seed)
+        
+        return _draw_intensity(self.rng, config.signal_prob, int(config.block_size))
+
+    def generate_states(self,
+                        config: SimulationConfig,
+                        seed: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
         """
         Generate Alice's quantum states and intensity array
         
         Args:
             config: Simulation parameters
+            seed: Optional seed; seeded patterns are cached and returned read-only
             
         Returns:
             Tuple of (states array, intensity array)
         """
-        # Generate random states based on probabilities
-        states = np.random.choice(
-            [config.signal_power, config.decoy_power],
-            p=[config.signal_prob, 1 - config.signal_prob],
-            size=int(config.block_size)
-        )
+        intensity = self.generate_intensity(config, seed)
         
-        # Create intensity array for cross-correlation
-        intensity = (states == config.signal_power).astype(int)
+        # Materialize powers from the two-entry codebook indexed by the pattern; float64
+        # keeps them exactly equal to the configured mu1/mu2
+        codebook = np.array([config.decoy_power, config.signal_power], dtype=np.float64)
+        states = codebook.take(intensity)
         
         return states, intensity
 
     def apply_channel_effects(self, 
-                            states: np.ndarray,
+                            states: Optional[np.ndarray],
                             config: SimulationConfig,
-                            delay: Optional[int] = None) -> np.ndarray:
+                            delay: Optional[int] = None,
+                            signal_mask: Optional[np.ndarray] = None,
+                            rng: Optional[np.random.Generator] = None) -> np.ndarray:
         """
         Apply channel loss and add delay
         
         Args:
-            states: Input quantum states
+            states: Input quantum states (may be None when signal_mask is given)
             config: Simulation parameters
             delay: Optional fixed delay (for testing)
+            signal_mask: Optional intensity array from generate_states (1 = signal,
+                0 = decoy); when given, detection probabilities are looked up
+                instead of computed per pulse
+            rng: Optional generator for this call (defaults to the simulator's own)
             
         Returns:
             Modified states after channel effects
@@ -110,32 +352,52 @@ class QuantumChannelSimulator:
         # Convert dB loss to linear
         attenuation = 10 ** (config.channel_loss_db/10)
         
-        # Calculate dark count probability per bin
-        P_dark = 1 - np.exp(-config.dark_count_rate * config.time_bin * 1E-12)
+        # Calculate dark count probability per bin (scalar math, accurate for tiny rates)
+        P_dark = -math.expm1(-config.dark_count_rate * config.time_bin * 1E-12)
+        
+        rng = self.rng if rng is None else rng
         
         # Apply loss and add delay
         if delay is None:
-            delay = config.max_offset + np.random.randint(0, 1001)
+            delay = config.max_offset + int(rng.integers(0, _MAX_EXTRA_DELAY + 1))
             
-        # Add padding for delay
-        front_pad = np.random.choice(
-            [config.signal_power, config.decoy_power],
-            p=[config.signal_prob, 1 - config.signal_prob],
-            size=delay
-        )
-        end_pad = np.random.choice(
-            [config.signal_power, config.decoy_power],
-            p=[config.signal_prob, 1 - config.signal_prob],
-            size=delay
-        )
-        extended_states = np.concatenate((front_pad, states, end_pad))
+        # Detection probability P_dark + 1 - exp(-s * attenuation) for each pulse
+        n_pulses = len(signal_mask) if states is None else len(states)
+        end = delay + n_pulses
+        total = end + delay
+        
+        # Size the buffers for the largest random delay so later calls reuse them
+        if self._prob_buf is None or len(self._prob_buf) < total:
+            capacity = max(total, n_pulses + 2 * (config.max_offset + _MAX_EXTRA_DELAY))
+            self._prob_buf = np.empty(capacity, dtype=np.float32)
+            self._rand_buf = np.empty(capacity, dtype=np.float64)
+        detection_prob = self._prob_buf[:total]
+        
+        # Signal and decoy pulses only take two detection probabilities, so precompute
+        # them once (indexed by a mask: 0 = decoy, 1 = signal)
+        pulse_probs = np.array([P_dark - math.expm1(-config.decoy_power * attenuation),
+                                P_dark - math.expm1(-config.signal_power * attenuation)],
+                               dtype=np.float32)
+        
+        # Padding pulses are drawn here and written straight into the buffer
+        pad_mask = (rng.random(2 * delay, dtype=np.float32) < config.signal_prob).view(np.uint8)
+        np.take(pulse_probs, pad_mask[:delay], out=detection_prob[:delay])
+        np.take(pulse_probs, pad_mask[delay:], out=detection_prob[end:])
         
-        # Apply loss and detection probability
-        detection_prob = 1 - np.exp(-extended_states * attenuation)
-        detection_prob += P_dark  # Add dark counts
+        # Alice's pulses come from the lookup table when her mask is known,
+        # otherwise loss is applied to the states in place within the buffer
+        body = detection_prob[delay:end]
+        if signal_mask is not None:
+            np.take(pulse_probs, signal_mask, out=body)
+        else:
+            np.multiply(states, -attenuation, out=body)
+            np.expm1(body, out=body)
+            np.subtract(P_dark, body, out=body)
         
-        # Generate detection events
-        detections = np.random.rand(len(detection_prob)) < detection_prob
+        # Generate detection events; float64 uniforms keep probabilities far below
+        # float32's 2**-24 draw resolution (high loss, dark counts) accurate
+        uniforms = rng.random(out=self._rand_buf[:total])
+        detections = uniforms < detection_prob
         
         return detections, delay
 
@@ -143,27 +405,46 @@ class QuantumChannelSimulator:
                   intensity: np.ndarray,
                   detections: np.ndarray,
                   config: SimulationConfig,
-                  actual_delay: int) -> Tuple[np.ndarray, np.ndarray, int, bool]:
+                  actual_delay: int,
+                  seed: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, int, bool]:
         """
         Find delay using cross-correlation
         
+        Detections are padded symmetrically around Alice's block, so only lags
+        within max_offset of that nominal alignment are correlated.
+        
         Args:
             intensity: Alice's intensity array
             detections: Bob's detection events
             config: Simulation parameters
             actual_delay: The actual delay added
+            seed: Seed the intensity pattern was generated with, if any
             
         Returns:
             Tuple of (time points, cross correlation, found delay, success flag)
         """
-        # Calculate cross-correlation
-        cross_corr = correlate(intensity, detections, mode='valid', method='fft')
+        # Restrict the search to +/- max_offset around the nominal alignment
+        total_lags = len(detections) - len(intensity) + 1
+        center = total_lags // 2
+        first_lag = max(0, center - config.max_offset)
+        last_lag = min(total_lags, center + config.max_offset + 1)
+        
+        # Calculate cross-correlation, bit-packed when both signals are binary
+        # and the lag window is narrow enough to beat the FFT
+        if (_prefer_packed(len(intensity), len(detections), last_lag - first_lag)
+                and _is_binary(intensity) and _is_binary(detections)):
+            cross_corr = _packed_correlate_valid(intensity, detections,
+                                                 first_lag, last_lag - first_lag)
+        else:
+            pattern_key = None if seed is None else (config.signal_prob, int(config.block_size), seed)
+            cross_corr = _rfft_correlate_valid(intensity, detections,
+                                               first_lag, last_lag - first_lag, pattern_key)
         
         # Find optimal lag
-        optimal_lag = np.argmax(cross_corr)
+        optimal_lag = first_lag + np.argmax(cross_corr)
         
-        # Generate time points centered around optimal lag
-        time_points = np.arange(len(cross_corr)) - len(cross_corr)//2
+        # Generate time points for the correlated lags, on the same axis as the peak
+        time_points = np.arange(first_lag, last_lag)
         
         # Check if found delay matches actual delay within tolerance
         sync_success = abs(optimal_lag - actual_delay) <= abs(config.sync_error_ppm * 1e-6 * config.block_size)
@@ -183,40 +464,54 @@ class QuantumChannelSimulator:
         Returns:
             Tuple of (total counts, mean rate, QBER)
         """
-        # Calculate total counts and rate
-        total_counts = np.sum(detections)
+        # Calculate total counts (SIMD byte counting for boolean arrays) and rate
+        total_counts = int(np.count_nonzero(detections))
         duration = len(detections) * config.time_bin * 1E-12  # seconds
         mean_rate = total_counts / duration
         
         # Estimate QBER from dark count contribution
         signal_window = config.time_bin * 1E-12  # seconds
         dark_contribution = config.dark_count_rate * signal_window
-        qber = dark_contribution / (total_counts / len(detections))
+        # A block without detections leaves the QBER unbounded; report inf as the
+        # NumPy division did rather than raising ZeroDivisionError
+        if total_counts == 0:
+            qber = float('inf')
+        else:
+            qber = dark_contribution / (total_counts / len(detections))
         
         return total_counts, mean_rate, qber
 
-    def run(self, config_dict: Dict[str, Any]) -> Dict[str, Any]:
+    def run(self, config_dict: Dict[str, Any], seed: Optional[int] = None) -> Dict[str, Any]:
         """
         Run complete channel simulation
         
         Args:
             config_dict: Dictionary of simulation parameters
+            seed: Optional seed for reproducible runs; Alice's pattern is reused
+                across runs with the same seed, signal probability and block size,
+                and the channel draws from its own seeded stream so unseeded runs
+                on this simulator stay random
             
         Returns:
             Dictionary containing simulation results
         """
+        rng = None if seed is None else _seeded_rng(seed, _CHANNEL_STREAM)
+        
         # Validate configuration
         config = self.validate_config(config_dict)
         
-        # Generate Alice's states
-        states, intensity = self.generate_states(config)
+        # Generate Alice's pattern; float states are never needed since the
+        # channel looks detection probabilities up by signal/decoy index
+        intensity = self.generate_intensity(config, seed)
         
         # Apply channel effects
-        detections, actual_delay = self.apply_channel_effects(states, config)
+        detections, actual_delay = self.apply_channel_effects(None, config,
+                                                              signal_mask=intensity,
+                                                              rng=rng)
         
         # Find delay using cross-correlation
         time_points, cross_corr, found_delay, sync_success = self.find_delay(
-            intensity, detections, config, actual_delay
+            intensity, detections, config, actual_delay, seed
         )
         
         # Calculate statistics
@@ -234,16 +529,25 @@ class QuantumChannelSimulator:
             sync_success=sync_success
         )
         
-        # Convert to dictionary for JSON serialization
+        # Sum detections into at most _MAX_COUNT_POINTS bins for plotting
+        bin_size = max(1, -(-len(results.counts) // _MAX_COUNT_POINTS))
+        binned_counts = np.add.reduceat(results.counts.view(np.uint8),
+                                        np.arange(0, len(results.counts), bin_size),
+                                        dtype=np.int64)
+        
+        # Convert to dictionary for JSON serialization; the arrays are bounded by
+        # 2 * max_offset + 1 lags and _MAX_COUNT_POINTS bins, and NumPy scalars
+        # become native Python values so jsonify can encode them
         return {
             'time_points': results.time_points.tolist(),
             'cross_correlation': results.cross_correlation.tolist(),
-            'counts': results.counts.tolist(),
+            'counts': binned_counts.tolist(),
+            'counts_bin_size': bin_size,
             'peak_position': int(results.peak_position),
             'statistics': {
-                'total_counts': results.total_counts,
-                'mean_count_rate': results.mean_count_rate,
-                'qber': results.qber,
-                'sync_success': results.sync_success
+                'total_counts': int(results.total_counts),
+                'mean_count_rate': float(results.mean_count_rate),
+                'qber': float(results.qber),
+                'sync_success': bool(results.sync_success)
             }
         }
\ No newline at end of file
@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from src.config.parameter_handler import ConfigManager
+
+class TestConfigCache(unittest.TestCase):
+    def setUp(self):
+        """Write a configuration file into a fresh temporary directory"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.config_path = Path(self.tmp_dir.name) / 'config.yaml'
+        self.cache_path = Path(self.tmp_dir.name) / 'config.yaml.cache.json'
+        self.config_path.write_text('alice:\n  power: -5\n')
+        self.manager = ConfigManager()
+
+    def test_first_load_writes_cache(self):
+        """Test that the first load stores the parsed contents in the sidecar"""
+        config = self.manager.load_config(str(self.config_path))
+        self.assertEqual(config['alice']['power'], -5)
+        self.assertTrue(self.cache_path.exists())
+
+    def test_second_load_uses_cache(self):
+        """Test that an unchanged file is served from the sidecar without parsing"""
+        self.manager.load_config(str(self.config_path))
+        with mock.patch('src.config.parameter_handler.yaml.load') as load:
+            config = self.manager.load_config(str(self.config_path))
+        load.assert_not_called()
+        self.assertEqual(config['alice']['power'], -5)
+
+    def test_rewritten_file_invalidates_cache(self):
+        """Test that new file contents are parsed again instead of read from the sidecar"""
+        self.manager.load_config(str(self.config_path))
+        self.config_path.write_text('alice:\n  power: -20\n')
+        stat = self.config_path.stat()
+        os.utime(self.config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        
+        config = self.manager.load_config(str(self.config_path))
+        self.assertEqual(config['alice']['power'], -20)
+
+    def test_unwritable_directory_still_loads(self):
+        """Test that a failed sidecar write leaves the file loadable and uncached"""
+        with mock.patch.object(Path, 'write_text', side_effect=PermissionError):
+            config = self.manager.load_config(str(self.config_path))
+        self.assertEqual(config['alice']['power'], -5)
+        self.assertFalse(self.cache_path.exists())
+
+    def test_lossy_contents_not_cached(self):
+        """Test that contents JSON cannot round-trip (integer keys) are not cached"""
+        self.config_path.write_text('alice:\n  power: -5\nlabels:\n  1: first\n')
+        self.manager.load_config(str(self.config_path))
+        self.assertFalse(self.cache_path.exists())
+
+if __name__ == '__main__':
+    unittest.main()
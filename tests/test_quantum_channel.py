@@ -1,17 +1,32 @@
 import unittest
 import numpy as np
-from src.simulation.quantum_channel import QuantumChannelSimulator
+from scipy.signal import correlate
+from src.simulation.quantum_channel import (
+    QuantumChannelSimulator,
+    _packed_correlate_valid,
+    _rfft_correlate_valid,
+    _seeded_intensity,
+)
 
 class TestQuantumChannel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Build constants shared by all tests"""
+        # Alice's parameters, copied into each test config
+        cls._alice_params = {
+            'mu1': 0.1,  # Signal state power
+            'mu2': 0.05,  # Decoy state power
+            'p1': 0.8,   # Probability of signal state
+        }
+        
+        # Allowed state powers (mu1, mu2), taken from the same parameters
+        cls._mu_array = np.array([cls._alice_params['mu1'], cls._alice_params['mu2']])
+
     def setUp(self):
         """Initialize test environment before each test"""
-        self.simulator = QuantumChannelSimulator()
+        self.simulator = QuantumChannelSimulator(seed=0)
         self.test_config = {
-            'alice': {
-                'mu1': 0.1,  # Signal state power
-                'mu2': 0.05,  # Decoy state power
-                'p1': 0.8,   # Probability of signal state
-            },
+            'alice': dict(self._alice_params),
             'bob': {
                 'darkCount': 100,  # Dark counts per second
                 'timeBin': 100e-12  # Time bin width in seconds
@@ -49,23 +64,25 @@ class TestQuantumChannel(unittest.TestCase):
     def test_state_generation(self):
         """Test quantum state generation"""
         config = self.simulator.validate_config(self.test_config)
-        block_size = config['processing']['blockSize']
+        block_size = config.block_size
         
         # Generate states
-        states = self.simulator.generate_states(config)
+        states, intensity = self.simulator.generate_states(config)
         
         # Check array dimensions
         self.assertEqual(len(states), block_size)
+        self.assertEqual(len(intensity), block_size)
         
         # Check state values
-        unique_states = np.unique(states)
-        self.assertTrue(all(s in [config['alice']['mu1'], config['alice']['mu2']] 
-                          for s in unique_states))
+        np.testing.assert_array_equal(np.isin(states, self._mu_array), True)
+        
+        # Check intensity marks the signal states
+        np.testing.assert_array_equal(intensity == 1, states == config.signal_power)
         
         # Check state distribution
-        signal_count = np.sum(states == config['alice']['mu1'])
+        signal_count = np.sum(states == config.signal_power)
         signal_prob = signal_count / block_size
-        self.assertAlmostEqual(signal_prob, config['alice']['p1'], delta=0.1)
+        self.assertAlmostEqual(signal_prob, config.signal_prob, delta=0.1)
 
     def test_channel_effects(self):
         """Test quantum channel effects"""
@@ -87,17 +104,18 @@ class TestQuantumChannel(unittest.TestCase):
     def test_detection(self):
         """Test photon detection simulation"""
         config = self.simulator.validate_config(self.test_config)
-        states = self.simulator.generate_states(config)
-        transmitted = self.simulator.apply_channel_effects(states, config)
+        states, intensity = self.simulator.generate_states(config)
         
-        # Simulate detection
-        detected = self.simulator.simulate_detection(transmitted, config)
+        # Simulate transmission and detection
+        detected, delay = self.simulator.apply_channel_effects(states, config)
         
-        # Check dimensions
-        self.assertEqual(len(detected), len(transmitted))
+        # Check dimensions (Alice's block padded by the delay on both sides)
+        self.assertEqual(len(detected), len(states) + 2 * delay)
         
         # Check binary output (0 or 1)
-        self.assertTrue(np.all(np.logical_or(detected == 0, detected == 1)))
+        self.assertEqual(detected.dtype.itemsize, 1)
+        self.assertLessEqual(int(detected.max(initial=0)), 1)
+        self.assertGreaterEqual(int(detected.min(initial=0)), 0)
         
         # Check detection probability is reasonable
         detection_prob = np.mean(detected)
@@ -105,26 +123,28 @@ class TestQuantumChannel(unittest.TestCase):
 
     def test_cross_correlation(self):
         """Test timing analysis using cross-correlation"""
+        # Bright signal pulses over a lossless channel give a clear peak
+        self.test_config['alice']['mu1'] = 2.0
+        self.test_config['channel']['loss'] = 0
         config = self.simulator.validate_config(self.test_config)
-        states = self.simulator.generate_states(config)
-        transmitted = self.simulator.apply_channel_effects(states, config)
-        detected = self.simulator.simulate_detection(transmitted, config)
+        states, intensity = self.simulator.generate_states(config, seed=7)
+        detected, delay = self.simulator.apply_channel_effects(states, config)
         
         # Calculate cross-correlation
-        correlation = self.simulator.calculate_correlation(detected, config)
+        time_points, correlation, found_delay, sync_success = self.simulator.find_delay(
+            intensity, detected, config, delay
+        )
         
         # Check dimensions
-        max_offset = config['processing']['maxOffset']
+        max_offset = config.max_offset
         expected_length = 2 * max_offset + 1
         self.assertEqual(len(correlation), expected_length)
+        self.assertEqual(len(time_points), expected_length)
         
-        # Check correlation values are normalized
-        self.assertTrue(np.all(correlation >= -1))
-        self.assertTrue(np.all(correlation <= 1))
-        
-        # Check peak exists
-        peak_idx = np.argmax(correlation)
-        self.assertTrue(0 <= peak_idx < len(correlation))
+        # Check the correlation (raw overlap counts) peaks at the applied delay
+        self.assertEqual(time_points[np.argmax(correlation)], delay)
+        self.assertEqual(found_delay, delay)
+        self.assertTrue(sync_success)
 
     def test_statistics(self):
         """Test statistical analysis of results"""
@@ -147,5 +167,81 @@ class TestQuantumChannel(unittest.TestCase):
         self.assertTrue(0 <= stats['qber_estimate'] <= 1)
         self.assertTrue(stats['signal_counts'] <= stats['total_counts'])
 
+    def test_statistics_without_detections(self):
+        """Test that a block with no detections reports an infinite QBER"""
+        self.test_config['channel']['loss'] = -100  # Lowest loss the UI allows
+        self.test_config['bob']['darkCount'] = 0
+        
+        for _ in range(3):
+            results = self.simulator.run(self.test_config)
+            self.assertEqual(results['statistics']['total_counts'], 0)
+            self.assertEqual(results['statistics']['qber'], float('inf'))
+
+    def test_peak_on_time_axis(self):
+        """Test that the reported peak lies on the plotted correlation axis"""
+        results = self.simulator.run(self.test_config)
+        self.assertIn(results['peak_position'], results['time_points'])
+
+    def test_seeded_runs_reproducible(self):
+        """Test that the same seed gives the same result on separate simulators"""
+        first = QuantumChannelSimulator().run(self.test_config, seed=42)
+        second = QuantumChannelSimulator().run(self.test_config, seed=42)
+        self.assertEqual(first, second)
+
+    def test_seeded_pattern_read_only(self):
+        """Test that the cached seeded pattern cannot be modified by callers"""
+        config = self.simulator.validate_config(self.test_config)
+        intensity = self.simulator.generate_intensity(config, seed=42)
+        self.assertFalse(intensity.flags.writeable)
+        with self.assertRaises(ValueError):
+            intensity[0] = 1
+
+    def test_unseeded_runs_after_seeded_run(self):
+        """Test that a seeded run does not make later unseeded runs deterministic"""
+        simulator = QuantumChannelSimulator()
+        simulator.run(self.test_config, seed=42)
+        first = simulator.run(self.test_config)
+        
+        other = QuantumChannelSimulator()
+        other.run(self.test_config, seed=42)
+        second = other.run(self.test_config)
+        self.assertNotEqual(first['counts'], second['counts'])
+
+class TestCorrelationKernels(unittest.TestCase):
+    def setUp(self):
+        """Build a binary intensity pattern and a longer detection stream"""
+        rng = np.random.default_rng(0)
+        self.intensity = (rng.random(1003) < 0.8).view(np.uint8)
+        self.detections = rng.random(1003 + 2 * 171) < 0.3
+        self.expected = correlate(self.intensity.astype(float), self.detections, mode='valid')
+
+    def test_rfft_matches_correlate(self):
+        """Real-FFT correlation reproduces scipy's 'valid' correlation"""
+        corr = _rfft_correlate_valid(self.intensity, self.detections)
+        np.testing.assert_allclose(corr, self.expected, atol=1e-9)
+
+    def test_rfft_lag_window(self):
+        """Real-FFT correlation over a lag window matches the same slice of the full result"""
+        corr = _rfft_correlate_valid(self.intensity, self.detections, 121, 101)
+        np.testing.assert_allclose(corr, self.expected[121:222], atol=1e-9)
+
+    def test_rfft_seeded_spectrum(self):
+        """Real-FFT correlation with a cached seeded spectrum matches the uncached result"""
+        intensity = _seeded_intensity(0.8, 1003, 7)
+        expected = _rfft_correlate_valid(intensity, self.detections)
+        for _ in range(2):
+            corr = _rfft_correlate_valid(intensity, self.detections, pattern_key=(0.8, 1003, 7))
+            np.testing.assert_allclose(corr, expected, atol=1e-9)
+
+    def test_packed_matches_correlate(self):
+        """Bit-packed popcount correlation reproduces scipy's 'valid' correlation"""
+        corr = _packed_correlate_valid(self.intensity, self.detections)
+        np.testing.assert_array_equal(corr, self.expected)
+
+    def test_packed_lag_window(self):
+        """Bit-packed correlation over a lag window matches the same slice of the full result"""
+        corr = _packed_correlate_valid(self.intensity, self.detections, 121, 101)
+        np.testing.assert_array_equal(corr, self.expected[121:222])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file